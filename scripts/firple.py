@@ -1,24 +1,58 @@
 #!/usr/bin/env python3
 
+from __future__ import annotations
+
 import atexit
+import hashlib
 import itertools
+import json
 import math
 import os
 import re
 import shutil
+import socket
 import subprocess
 import sys
+import time
 from argparse import ArgumentParser, Namespace
 from contextlib import AbstractContextManager, nullcontext
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from fractions import Fraction
-from typing import Iterable, Self
-
-import fontforge
-import psMat
-from fontTools.ttLib import TTFont, newTable
-from fontTools.ttLib.tables._n_a_m_e import NameRecord
-from settings import *
+from functools import partial
+from queue import Queue
+from threading import Thread
+from typing import TYPE_CHECKING, Callable, Iterable, Self
+from zipfile import ZIP_DEFLATED, ZipFile
+
+from settings import (
+    COPYRIGHT,
+    COVERAGE_PROFILES,
+    FAMILY,
+    FEATURE_GLYPH_NAMES,
+    ITALIC_GLYPH_NAMES,
+    ITALIC_OFFSET,
+    ITALIC_SKEW,
+    JOB_POLL_INTERVAL,
+    JOB_TIMEOUT,
+    MAX_JOB_ATTEMPTS,
+    MAX_SINGLE_SUBST_GLYPHS,
+    NERD_PATCHER,
+    OUT_DIR,
+    OVERWRITE_GLYPH_NAMES,
+    PLEX_SCALE,
+    SLIM_SCALE,
+    SRC_DIR,
+    SRC_FILES,
+    TMP_DIR,
+    VERSION,
+)
+from store import ArtifactStore, JobQueue
+
+# heavy modules are imported by the stages which need them,
+# so that helper commands (--help, plan) start quickly
+if TYPE_CHECKING:
+    import fontforge
+    from fontTools.ttLib import TTFont
 
 # (feature, ((script, (lang, ...)), ...))
 type FeatureData = tuple[str, tuple[tuple[str, tuple[str, ...]], ...]]
@@ -30,8 +64,11 @@ class FontParams:
     bold: bool
     italic: bool
     nerd: bool
+    dedup: bool
+    compact: bool
     freeze_features: list[str]
     ext: str
+    coverage: str = "full"
     family: str = field(init=False)
     weight: str = field(init=False)
     subfamily: str = field(init=False)
@@ -51,9 +88,15 @@ class FontParams:
         self.fullname = f"{self.family} {self.subfamily}"
         self.psname = f"{self.family}-{self.subfamily}".replace(" ", "")
 
+    def options(self) -> dict:
+        # init fields, from which the other fields are derived
+        return {f.name: getattr(self, f.name) for f in fields(self) if f.init}
+
 
 class FontForgeFont:
     def __init__(self, path) -> None:
+        import fontforge
+
         with ErrorSuppressor.suppress():
             self.font = fontforge.open(path)
 
@@ -88,24 +131,117 @@ class ErrorSuppressor:
         return cls() if cls.enable else nullcontext()
 
 
-def generate(params: FontParams) -> None:
+class Packager:
+    """Packs generated fonts into release archives in a background thread."""
+
+    def __init__(self) -> None:
+        self.queue: Queue[tuple[str, FontParams] | None] = Queue()
+        self.checksums: dict[str, str] = {}
+        self.error: BaseException | None = None
+        self.thread = Thread(target=self.run)
+
+    def __enter__(self) -> Self:
+        self.thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.queue.put(None)
+        self.thread.join()
+        if self.error is not None and exc_type is None:
+            raise self.error
+        if exc_type is None:
+            self.write_checksums()
+
+    def add(self, path: str, params: FontParams) -> None:
+        self.queue.put((path, params))
+
+    def run(self) -> None:
+        archives: dict[str, ZipFile] = {}
+        try:
+            while (item := self.queue.get()) is not None:
+                path, params = item
+                archive_path = f'{OUT_DIR}/{params.family.replace(" ", "")}.zip'
+                if archive_path not in archives:
+                    archives[archive_path] = ZipFile(archive_path, "w", ZIP_DEFLATED)
+                # read font file once for both the archive and the checksum
+                digest = hashlib.sha256()
+                with (
+                    open(path, "rb") as src,
+                    archives[archive_path].open(os.path.basename(path), "w") as dst,
+                ):
+                    while chunk := src.read(1 << 20):
+                        digest.update(chunk)
+                        dst.write(chunk)
+                self.checksums[os.path.basename(path)] = digest.hexdigest()
+        except BaseException as e:
+            self.error = e
+            # keep draining queue so that the main thread never blocks
+            while self.queue.get() is not None:
+                pass
+        finally:
+            for archive_path, archive in archives.items():
+                archive.close()
+                self.checksums[os.path.basename(archive_path)] = file_sha256(
+                    archive_path
+                )
+
+    def write_checksums(self) -> None:
+        print("Writing checksums...")
+        with open(f"{OUT_DIR}/SHA256SUMS", "w", encoding="UTF-8") as f:
+            for name, digest in sorted(self.checksums.items()):
+                print(f"{digest}  {name}", file=f)
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(1 << 20):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def generate(params: FontParams) -> str:
     print(f"[{params.fullname}]")
-    path = create_base_font(params)
-    path = apply_auto_hinting(path, params)
-    if params.nerd:
-        path = apply_nerd_patch(path, params)
-    path = set_font_params(path, params)
+    path = ""
+    for _, stage in build_stages(params):
+        path = stage(path, params)
     print(f"Generation complete! => {path}\n")
+    return path
+
+
+def build_stages(
+    params: FontParams,
+    tmp_dir: str = TMP_DIR,
+    out_dir: str = OUT_DIR,
+) -> list[tuple[str, Callable[[str, FontParams], str]]]:
+    # each stage takes the path of the previous output and returns its own
+    stages = [("base", lambda _, params: create_base_font(params, tmp_dir))]
+    if params.dedup:
+        stages.append(("dedup", deduplicate_outlines))
+    stages.append(("hint", partial(apply_auto_hinting, tmp_dir=tmp_dir)))
+    if params.nerd:
+        stages.append(("nerd", partial(apply_nerd_patch, tmp_dir=tmp_dir)))
+    stages.append(("params", partial(set_font_params, out_dir=out_dir)))
+    return stages
 
 
-def create_base_font(params: FontParams) -> str:
+def control_file_path(params: FontParams, tmp_dir: str = TMP_DIR) -> str:
+    return f"{tmp_dir}/{params.psname}-control.txt"
+
+
+def create_base_font(params: FontParams, tmp_dir: str = TMP_DIR) -> str:
+    import fontforge
+    import psMat
+
     frcd_path = SRC_FILES[params.weight][0]
     plex_path = SRC_FILES[params.weight][1]
-    out_path = f'{TMP_DIR}/{params.psname.replace(FAMILY, "Tmp")}.ttf'
+    out_path = f'{tmp_dir}/{params.psname.replace(FAMILY, "Tmp")}.ttf'
 
     # check if src font files exist
     required(params.fullname, [frcd_path, plex_path])
 
+    coverage = load_coverage(params.coverage)
+
     with (
         FontForgeFont(frcd_path) as frcd,
         FontForgeFont(plex_path) as plex,
@@ -131,13 +267,17 @@ def create_base_font(params: FontParams) -> str:
             frcd.transform(psMat.scale(SLIM_SCALE, 1))
 
         print("Copying glyphs...")
-        copied_glyph_names = copy_glyphs(frcd, plex)
+        copied_glyph_names = copy_glyphs(frcd, plex, coverage)
 
         print("Copying lookups...")
         copy_lookups(frcd, plex)
 
         print("Creating features...")
         for tag, names in FEATURE_GLYPH_NAMES.items():
+            # skip glyphs excluded by coverage
+            names = [name for name in names if name in frcd]
+            if not names:
+                continue
             # check if glyph files exist
             glyph_paths = (
                 f"{SRC_DIR}/{tag}/{params.weight}/{name}.{tag}.svg" for name in names
@@ -202,7 +342,6 @@ def create_base_font(params: FontParams) -> str:
             frcd.generate(out_path)
 
         print("Generating hint control file...")
-        control_file_path = f"{TMP_DIR}/{params.psname}-control.txt"
         non_latin_glyphs = ", ".join(
             name
             for name in copied_glyph_names
@@ -211,7 +350,7 @@ def create_base_font(params: FontParams) -> str:
             )
             != "latn"
         )
-        with open(control_file_path, "w", encoding="UTF-8") as f:
+        with open(control_file_path(params, tmp_dir), "w", encoding="UTF-8") as f:
             print(f"none dflt @ {non_latin_glyphs}", file=f)
 
     return out_path
@@ -220,9 +359,14 @@ def create_base_font(params: FontParams) -> str:
 def copy_glyphs(
     frcd: fontforge.font,
     plex: fontforge.font,
+    coverage: frozenset[int] | None,
 ) -> list[str]:
+    # glyphs to be copied (None means all glyphs)
+    covered_names = None if coverage is None else covered_glyph_names(plex, coverage)
     # remove Plex prefered glyphs in advance
     for name in OVERWRITE_GLYPH_NAMES:
+        if covered_names is not None and name not in covered_names:
+            continue
         frcd[name].unlinkThisGlyph()
         frcd.removeGlyph(name)
     # copy glyphs
@@ -231,6 +375,9 @@ def copy_glyphs(
     total_glyphs = len(list(plex))
     for glyph in plex.glyphs():
         print(f"\r| {glyph.originalgid + 1} / {total_glyphs}", end="")
+        if covered_names is not None and glyph.glyphname not in covered_names:
+            # skip if out of coverage
+            continue
         if glyph.unicode >= 0:
             unicodes = {glyph.unicode}
             if glyph.altuni:
@@ -263,6 +410,78 @@ def copy_glyphs(
     return [frcd[slot].glyphname for slot in frcd.selection]
 
 
+def covered_glyph_names(plex: fontforge.font, coverage: frozenset[int]) -> set[str]:
+    names = set()
+    # (glyph name, names of substituted glyphs)
+    substitutions: list[tuple[str, list[str]]] = []
+    # (ligature glyph name, names of component glyphs)
+    ligatures: list[tuple[str, list[str]]] = []
+    for glyph in plex.glyphs():
+        unicodes = {glyph.unicode} | {u for u, _, _ in glyph.altuni or ()}
+        if any(u in coverage for u in unicodes):
+            names.add(glyph.glyphname)
+        for _, lookup_type, *data in glyph.getPosSub("*"):
+            if lookup_type in ["Position", "Pair"]:
+                # skip gpos lookup
+                continue
+            if lookup_type == "Ligature":
+                ligatures.append((glyph.glyphname, data))
+            else:
+                substitutions.append((glyph.glyphname, data))
+
+    # add unencoded glyphs reachable from covered glyphs by lookups
+    while True:
+        reachable = {
+            variant_name
+            for name, variant_names in substitutions
+            if name in names
+            for variant_name in variant_names
+        } | {
+            name
+            for name, component_names in ligatures
+            if all(component_name in names for component_name in component_names)
+        }
+        if reachable <= names:
+            return names
+        names |= reachable
+
+
+def load_coverage(spec: str) -> frozenset[int] | None:
+    if spec in COVERAGE_PROFILES:
+        if COVERAGE_PROFILES[spec] is None:
+            return None
+        ranges, jis_rows = COVERAGE_PROFILES[spec]
+        codepoints = {u for first, last in ranges for u in range(first, last + 1)}
+        if jis_rows is not None:
+            codepoints |= jis_x_0208_codepoints(*jis_rows)
+        return frozenset(codepoints)
+
+    # codepoint range file, e.g. "3040..309F; Hiragana" per line
+    required(f"coverage {spec}", [spec])
+    codepoints = set()
+    with open(spec, encoding="UTF-8") as f:
+        for line in f:
+            line = line.split("#")[0].split(";")[0].strip()
+            if not line:
+                continue
+            first, _, last = line.partition("..")
+            codepoints |= set(range(int(first, 16), int(last or first, 16) + 1))
+    return frozenset(codepoints)
+
+
+def jis_x_0208_codepoints(first_row: int, last_row: int) -> set[int]:
+    codepoints = set()
+    for row in range(first_row, last_row + 1):
+        for cell in range(1, 95):
+            try:
+                char = bytes([0xA0 + row, 0xA0 + cell]).decode("euc_jp")
+            except UnicodeDecodeError:
+                # unassigned
+                continue
+            codepoints.add(ord(char))
+    return codepoints
+
+
 def copy_lookups(
     frcd: fontforge.font,
     plex: fontforge.font,
@@ -345,6 +564,8 @@ def create_feature(
     plex: fontforge.font,
     params: FontParams,
 ) -> list[str]:
+    import psMat
+
     print(f"| Creating {tag} feature...")
     lookup_name = f"{tag} lookup"
     subtable_name = f"{tag} lookup subtable"
@@ -382,6 +603,8 @@ def freeze_feature(
     plex: fontforge.font,
     params: FontParams,
 ) -> list[str]:
+    import psMat
+
     print(f"| Freezing {tag} feature...")
     for name in glyph_names:
         glyph = frcd[frcd.findEncodingSlot(name)]
@@ -407,7 +630,57 @@ def feature_data_from_tag(tag: str) -> FeatureData:
     )
 
 
-def apply_auto_hinting(path: str, params: FontParams) -> str:
+def deduplicate_outlines(path: str, params: FontParams) -> str:
+    from fontTools.ttLib import TTFont
+    from fontTools.ttLib.tables._g_l_y_f import (
+        ROUND_XY_TO_GRID,
+        Glyph,
+        GlyphComponent,
+        flagOnCurve,
+    )
+
+    print("Deduplicating glyph outlines...")
+    out_path = path.replace(".ttf", ".dedup.ttf")
+    with TTFont(path) as font:
+        glyf = font["glyf"]
+        # (relative coordinates, end points, on-curve flags) -> (name, origin)
+        outlines: dict[tuple, tuple[str, tuple[int, int]]] = {}
+        count = 0
+        for name in font.getGlyphOrder():
+            glyph = glyf[name]
+            if glyph.numberOfContours <= 0:
+                # skip empty and composite glyph
+                continue
+            coords, end_pts, flags = glyph.getCoordinates(glyf)
+            x0, y0 = coords[0]
+            key = (
+                tuple((x - x0, y - y0) for x, y in coords),
+                tuple(end_pts),
+                bytes(f & flagOnCurve for f in flags),
+            )
+            if key not in outlines:
+                outlines[key] = (name, (x0, y0))
+                continue
+            # replace duplicate outline with translated reference to the first one
+            base_name, (base_x0, base_y0) = outlines[key]
+            component = GlyphComponent()
+            component.glyphName = base_name
+            component.x = x0 - base_x0
+            component.y = y0 - base_y0
+            component.flags = ROUND_XY_TO_GRID
+            composite = Glyph()
+            composite.numberOfContours = -1
+            composite.components = [component]
+            glyf[name] = composite
+            count += 1
+        font.save(out_path)
+
+    saved = os.path.getsize(path) - os.path.getsize(out_path)
+    print(f"| {count} glyphs deduplicated, {saved} bytes saved")
+    return out_path
+
+
+def apply_auto_hinting(path: str, params: FontParams, tmp_dir: str = TMP_DIR) -> str:
     print("Hinting glyphs...")
     out_path = path.replace(".ttf", ".hinted.ttf")
     cmd = [
@@ -417,7 +690,7 @@ def apply_auto_hinting(path: str, params: FontParams) -> str:
         "--default-script=latn",
         "--fallback-script=none",
         "--fallback-scaling",
-        f"--control-file={TMP_DIR}/{params.psname}-control.txt",
+        f"--control-file={control_file_path(params, tmp_dir)}",
         path,
         out_path,
     ]
@@ -429,7 +702,7 @@ def apply_auto_hinting(path: str, params: FontParams) -> str:
     return out_path
 
 
-def apply_nerd_patch(path: str, params: FontParams) -> str:
+def apply_nerd_patch(path: str, params: FontParams, tmp_dir: str = TMP_DIR) -> str:
     # check if nerd fonts patcher exists
     required("nerd fonts patching", [NERD_PATCHER])
 
@@ -443,7 +716,7 @@ def apply_nerd_patch(path: str, params: FontParams) -> str:
         "--complete",
         "--careful",
         "-out",
-        TMP_DIR,
+        tmp_dir,
     ]
     last_line = None
     with (
@@ -469,7 +742,11 @@ def apply_nerd_patch(path: str, params: FontParams) -> str:
     return out_path
 
 
-def set_font_params(path: str, params: FontParams) -> str:
+def set_font_params(path: str, params: FontParams, out_dir: str = OUT_DIR) -> str:
+    from fontTools.ttLib import TTFont, newTable
+    from fontTools.ttLib.tables._n_a_m_e import NameRecord
+    from fontTools.unicodedata import script
+
     print("Setting font parameters...")
     with (
         TTFont(SRC_FILES[params.weight][0]) as frcd,
@@ -510,26 +787,47 @@ def set_font_params(path: str, params: FontParams) -> str:
             frpl["name"].names.append(w_record)
 
         # meta table
+        languages = ["Hani", "Hira", "Hrkt", "Jpan", "Kana"]  # ISO 15924
+        if params.coverage != "full":
+            # drop languages whose scripts are no longer covered
+            scripts = {script(u) for u in frpl.getBestCmap()}
+            required_scripts = {
+                "Hani": {"Hani"},
+                "Hira": {"Hira"},
+                "Hrkt": {"Hira", "Kana"},
+                "Jpan": {"Hani", "Hira", "Kana"},
+                "Kana": {"Kana"},
+            }
+            languages = [
+                lang for lang in languages if required_scripts[lang] <= scripts
+            ]
         meta_table = newTable("meta")
         meta_table.data = {
-            "dlng": "Hani, Hira, Hrkt, Jpan, Kana",  # ISO 15924
-            "slng": "Hani, Hira, Hrkt, Jpan, Kana, Latn",  # ISO 15924
+            "dlng": ", ".join(languages),
+            "slng": ", ".join(languages + ["Latn"]),
         }
         frpl["meta"] = meta_table
 
         # OS/2 ranges
-        ranges = [
-            "ulUnicodeRange1",
-            "ulUnicodeRange2",
-            "ulUnicodeRange3",
-            "ulUnicodeRange4",
-            "ulCodePageRange1",
-            "ulCodePageRange2",
-        ]
-        for r in ranges:
-            setattr(
-                frpl["OS/2"], r, getattr(frcd["OS/2"], r) | getattr(plex["OS/2"], r)
-            )
+        if params.coverage == "full":
+            ranges = [
+                "ulUnicodeRange1",
+                "ulUnicodeRange2",
+                "ulUnicodeRange3",
+                "ulUnicodeRange4",
+                "ulCodePageRange1",
+                "ulCodePageRange2",
+            ]
+            for r in ranges:
+                setattr(
+                    frpl["OS/2"],
+                    r,
+                    getattr(frcd["OS/2"], r) | getattr(plex["OS/2"], r),
+                )
+        else:
+            # Plex's ranges include glyphs dropped by coverage filter
+            frpl["OS/2"].recalcUnicodeRanges(frpl)
+            frpl["OS/2"].recalcCodePageRanges(frpl)
 
         # fix xAvgCharWidth changed by FontForge
         original_width = frcd["OS/2"].xAvgCharWidth
@@ -552,16 +850,354 @@ def set_font_params(path: str, params: FontParams) -> str:
             frpl["hhea"].caretSlopeRun = frac.numerator
             frpl["hhea"].caretOffset = ITALIC_OFFSET
 
-        out_path = f"{OUT_DIR}/{params.psname}.{params.ext}"
+        if params.compact:
+            compact_lookups(frpl)
+
+        out_path = output_path(params, out_dir)
         if params.ext in ["woff", "woff2"]:
             frpl.flavor = params.ext
         frpl.save(out_path)
+    write_stamp(out_path, params)
 
     return out_path
 
 
+def compact_lookups(font: TTFont) -> None:
+    import fontTools.subset  # noqa: F401 (adds lookup helpers to GSUB/GPOS)
+
+    print("Compacting lookups...")
+    for tag in ["GSUB", "GPOS"]:
+        if tag not in font:
+            continue
+        table = font[tag]
+        lookups = table.table.LookupList.Lookup
+        total_lookups = len(lookups)
+
+        # remove empty subtables
+        for lookup in lookups:
+            lookup.SubTable = [st for st in lookup.SubTable if not is_empty_subtable(st)]
+            lookup.SubTableCount = len(lookup.SubTable)
+
+        merged = merge_single_substitutions(table) if tag == "GSUB" else set()
+
+        # remove merged and empty lookups (keep those referred by contextual lookups)
+        referred = {i for lookup in lookups for i in lookup.collect_lookups()}
+        table.subset_lookups(
+            [
+                i
+                for i, lookup in enumerate(lookups)
+                if i not in merged and (lookup.SubTableCount or i in referred)
+            ]
+        )
+        # remove lookups not reachable from any feature
+        table.prune_lookups()
+        print(f"| {tag}: {total_lookups} -> {table.table.LookupList.LookupCount} lookups")
+    # Coverage and SingleSubst formats are chosen by fontTools on compile,
+    # so the most compact one is written without doing anything here.
+
+
+def is_empty_subtable(subtable) -> bool:
+    subtable = getattr(subtable, "ExtSubTable", subtable)
+    # decompiled GSUB single, multiple, alternate and ligature substitution
+    for attr in ["mapping", "alternates", "ligatures"]:
+        if hasattr(subtable, attr):
+            return not getattr(subtable, attr)
+    # GPOS subtables and other coverage based subtables
+    for attr in ["Coverage", "MarkCoverage"]:
+        coverage = getattr(subtable, attr, None)
+        if coverage is None:
+            continue
+        if isinstance(coverage, list):
+            # context format 3 has a coverage for each input position
+            return not coverage or any(not c.glyphs for c in coverage)
+        return not coverage.glyphs
+    return False
+
+
+def merge_single_substitutions(table) -> set[int]:
+    lookups = table.table.LookupList.Lookup
+    feature_records = table.table.FeatureList.FeatureRecord
+    referred = {i for lookup in lookups for i in lookup.collect_lookups()}
+
+    def mergeable(index: int) -> bool:
+        lookup = lookups[index]
+        return (
+            lookup.LookupType == 1
+            and lookup.SubTable
+            and index not in referred
+            and all(st.LookupType == 1 for st in lookup.SubTable)
+        )
+
+    def feature_indices(index: int) -> frozenset[int]:
+        return frozenset(
+            i
+            for i, record in enumerate(feature_records)
+            if index in record.Feature.LookupListIndex
+        )
+
+    def mapping_of(index: int) -> dict[str, str]:
+        # former subtable takes precedence in a lookup
+        mapping = {}
+        for subtable in lookups[index].SubTable:
+            for key, value in subtable.mapping.items():
+                mapping.setdefault(key, value)
+        return mapping
+
+    merged = set()
+    target = None
+    for index, lookup in enumerate(lookups):
+        if not mergeable(index) or not feature_indices(index):
+            target = None
+            continue
+        mapping = mapping_of(index)
+        if target is not None:
+            target_lookup = lookups[target]
+            target_mapping = target_lookup.SubTable[0].mapping
+            # Merging adjacent lookups is equivalent to applying them in order
+            # as long as no glyph is substituted by both of them.
+            if (
+                lookup.LookupFlag == target_lookup.LookupFlag
+                and getattr(lookup, "MarkFilteringSet", None)
+                == getattr(target_lookup, "MarkFilteringSet", None)
+                and feature_indices(index) == feature_indices(target)
+                and not mapping.keys() & target_mapping.keys()
+                and not mapping.keys() & set(target_mapping.values())
+                and len(mapping) + len(target_mapping) <= MAX_SINGLE_SUBST_GLYPHS
+            ):
+                target_mapping.update(mapping)
+                merged.add(index)
+                continue
+        if len(mapping) > MAX_SINGLE_SUBST_GLYPHS:
+            # keep original subtables which cannot be collapsed into one
+            target = None
+            continue
+        # start a new merge target with a single subtable
+        lookup.SubTable[0].mapping = mapping
+        lookup.SubTable = lookup.SubTable[:1]
+        lookup.SubTableCount = len(lookup.SubTable)
+        target = index
+    return merged
+
+
+def coordinate(
+    params_list: list[FontParams],
+    store_root: str,
+    packager: Packager | None,
+) -> None:
+    store = ArtifactStore(store_root)
+    queue = JobQueue(store_root)
+    queue.reset()
+
+    # coverage range files are not on worker hosts; pass them via the store
+    coverage_keys: dict[str, str] = {}
+    for params in params_list:
+        if params.coverage in COVERAGE_PROFILES or params.coverage in coverage_keys:
+            continue
+        required(f"coverage {params.coverage}", [params.coverage])
+        coverage_keys[params.coverage] = store.put(params.coverage)
+
+    # job id -> (params, job) of jobs waiting for results
+    jobs: dict[str, tuple[FontParams, dict]] = {}
+
+    def push(params: FontParams, stage: int, path: str, files: dict, attempt: int):
+        name, _ = build_stages(params)[stage]
+        job = {
+            "id": f"{params.psname}-{stage}-{name}-{attempt}",
+            "params": params.options(),
+            "stage": stage,
+            "path": path,  # input font file name
+            "files": files,  # file name -> artifact key
+            "attempt": attempt,
+            "coverage": coverage_keys.get(params.coverage),  # artifact key
+        }
+        jobs[job["id"]] = (params, job)
+        queue.push(job)
+
+    for params in params_list:
+        push(params, 0, "", {}, 1)
+    remaining = len(params_list)
+    print(f"Waiting for workers on {store_root}...")
+
+    # time when a worker was last seen running a job or returning a result
+    last_activity = time.time()
+    while remaining:
+        time.sleep(JOB_POLL_INTERVAL)
+        results = queue.results("done")
+        for result in results:
+            if result["id"] not in jobs:
+                # result of the job given up on timeout
+                continue
+            params, job = jobs.pop(result["id"])
+            stages = build_stages(params)
+            print(f"[{params.fullname}] {stages[job['stage']][0]} done")
+            if job["stage"] + 1 < len(stages):
+                push(params, job["stage"] + 1, result["path"], result["files"], 1)
+                continue
+            out_path = f"{OUT_DIR}/{result['path']}"
+            store.get(result["files"][result["path"]], out_path)
+            write_stamp(out_path, params)
+            print(f"Generation complete! => {out_path}")
+            if packager is not None:
+                packager.add(out_path, params)
+            remaining -= 1
+
+        failures = queue.results("failed") + [
+            {"id": job["id"], "error": "worker did not respond"}
+            for job in queue.stale()
+        ]
+        for result in failures:
+            if result["id"] not in jobs:
+                continue
+            params, job = jobs.pop(result["id"])
+            print(f'| {job["id"]} failed: {result["error"]}', file=sys.stderr)
+            if job["attempt"] >= MAX_JOB_ATTEMPTS:
+                queue.stop()
+                sys.exit(
+                    f'Error: job failed {job["attempt"]} times for "{params.fullname}"'
+                )
+            push(params, job["stage"], job["path"], job["files"], job["attempt"] + 1)
+
+        if results or failures or queue.has_running():
+            last_activity = time.time()
+        elif time.time() - last_activity > JOB_TIMEOUT:
+            queue.stop()
+            sys.exit(f"Error: no worker has claimed jobs for {JOB_TIMEOUT} seconds")
+
+    # let workers exit
+    queue.stop()
+
+
+def work(store_root: str, keep_tmp_files: bool) -> None:
+    # workers sharing a host must not share temporary or output files
+    tmp_dir = f"{TMP_DIR}/worker-{socket.gethostname()}-{os.getpid()}"
+    atexit.register(cleanup, tmp_dir, keep_tmp_files)
+
+    store = ArtifactStore(store_root)
+    queue = JobQueue(store_root)
+    print(f"Waiting for jobs on {store_root}...")
+
+    # a run which had finished before this worker started is not for this worker
+    finished_run = queue.stopped_run()
+    while queue.stopped_run() in [None, finished_run]:
+        job = queue.claim()
+        if job is None:
+            time.sleep(JOB_POLL_INTERVAL)
+            continue
+        # start every job with an empty directory holding only its inputs
+        cleanup(tmp_dir, keep_tmp_files)
+        os.makedirs(tmp_dir, exist_ok=True)
+        options = job["params"]
+        if job["coverage"] is not None:
+            options = dict(options, coverage=f"{tmp_dir}/coverage.txt")
+        params = FontParams(**options)
+        name, stage = build_stages(params, tmp_dir, tmp_dir)[job["stage"]]
+        print(f"[{params.fullname}] {name} (attempt {job['attempt']})")
+        heartbeat = queue.heartbeat(job["id"])
+        try:
+            if job["coverage"] is not None:
+                store.get(job["coverage"], params.coverage)
+            for file_name, key in job["files"].items():
+                store.get(key, f"{tmp_dir}/{file_name}")
+            path = stage(f"{tmp_dir}/{job['path']}" if job["path"] else "", params)
+            # pass side files (e.g. hint control file) on to the next stages
+            files = {k: v for k, v in job["files"].items() if k != job["path"]}
+            files[os.path.basename(path)] = store.put(path)
+            if name == "base":
+                control_path = control_file_path(params, tmp_dir)
+                files[os.path.basename(control_path)] = store.put(control_path)
+            queue.finish(
+                job["id"],
+                {"id": job["id"], "path": os.path.basename(path), "files": files},
+            )
+        except (Exception, SystemExit) as e:
+            queue.finish(job["id"], {"id": job["id"], "error": repr(e)}, failed=True)
+        finally:
+            heartbeat.set()
+
+
+def output_path(params: FontParams, out_dir: str = OUT_DIR) -> str:
+    return f"{out_dir}/{params.psname}.{params.ext}"
+
+
+def input_paths(params: FontParams) -> list[str]:
+    scripts_dir = os.path.dirname(os.path.abspath(__file__))
+    paths = [
+        *SRC_FILES[params.weight],
+        f"{scripts_dir}/firple.py",
+        f"{scripts_dir}/settings.py",
+    ]
+    if params.italic:
+        paths += [
+            f"{SRC_DIR}/italic/{params.weight}/{name}.svg"
+            for name in ITALIC_GLYPH_NAMES
+        ]
+    for tag, names in FEATURE_GLYPH_NAMES.items():
+        paths += [f"{SRC_DIR}/{tag}/{params.weight}/{name}.{tag}.svg" for name in names]
+    if params.nerd:
+        paths.append(NERD_PATCHER)
+    if params.coverage not in COVERAGE_PROFILES:
+        paths.append(params.coverage)
+    return paths
+
+
+def stamp_path(path: str) -> str:
+    return f"{path}.json"
+
+
+def write_stamp(path: str, params: FontParams) -> None:
+    # record options used to build the font for plan command
+    with open(stamp_path(path), "w", encoding="UTF-8") as f:
+        json.dump(params.options(), f)
+
+
+def build_status(params: FontParams) -> str:
+    out_path = output_path(params)
+    if not os.path.exists(out_path):
+        return "missing"
+    paths = input_paths(params)
+    if not all(os.path.exists(path) for path in paths):
+        return "no-source"
+    newest_input = max(os.path.getmtime(path) for path in paths)
+    if os.path.getmtime(out_path) < newest_input:
+        return "outdated"
+    # built with other options (or by older script without stamp)
+    if not os.path.exists(stamp_path(out_path)):
+        return "outdated"
+    with open(stamp_path(out_path), encoding="UTF-8") as f:
+        if json.load(f) != params.options():
+            return "outdated"
+    return "up-to-date"
+
+
+def plan(params_list: list[FontParams]) -> None:
+    for params in params_list:
+        options = [
+            name
+            for name, enabled in [
+                ("nerd", params.nerd),
+                ("dedup", params.dedup),
+                ("compact", params.compact),
+            ]
+            if enabled
+        ] + [f"freeze:{tag}" for tag in params.freeze_features]
+        options.append(f"coverage:{params.coverage}")
+        print(
+            f"{build_status(params):<10} {output_path(params):<32} "
+            f'[{", ".join(options)}]'
+        )
+
+
 def parse_arguments() -> Namespace:
     parser = ArgumentParser()
+    parser.add_argument(
+        "command",
+        nargs="?",
+        choices=["build", "plan", "coordinate", "work"],
+        default="build",
+        help="build fonts (default), print the variants to be built and "
+        "whether their outputs are up to date, or build fonts on several "
+        "machines sharing a store (coordinate on one, work on each)",
+    )
     parser.add_argument(
         "-a",
         "--all",
@@ -581,6 +1217,18 @@ def parse_arguments() -> Namespace:
         action="store_false",
         help="disable nerd fonts patching",
     )
+    parser.add_argument(
+        "--disable-outline-dedup",
+        dest="dedup",
+        action="store_false",
+        help="disable replacing duplicate outlines with component references",
+    )
+    parser.add_argument(
+        "--disable-lookup-compaction",
+        dest="compact",
+        action="store_false",
+        help="disable merging and pruning GSUB/GPOS lookups",
+    )
     parser.add_argument(
         "--freeze-features",
         choices=FEATURE_GLYPH_NAMES.keys(),
@@ -588,12 +1236,30 @@ def parse_arguments() -> Namespace:
         nargs="*",
         help="freeze specified OpenType features",
     )
+    parser.add_argument(
+        "--coverage",
+        default="full",
+        metavar="PROFILE_OR_FILE",
+        help="copy only Plex glyphs in a coverage profile "
+        f"({', '.join(COVERAGE_PROFILES)}) or in a codepoint range file "
+        '(lines like "3040..309F"); default: full',
+    )
     parser.add_argument(
         "--ext",
         choices=["ttf", "otf", "woff", "woff2"],
         default="ttf",
         help="extension of the font to be output",
     )
+    parser.add_argument(
+        "--package",
+        action="store_true",
+        help="pack generated fonts into zip archives with SHA-256 checksums",
+    )
+    parser.add_argument(
+        "--store",
+        metavar="DIR",
+        help="shared directory for jobs and artifacts of coordinate and work",
+    )
     parser.add_argument(
         "--keep-tmp-files",
         action="store_true",
@@ -605,7 +1271,10 @@ def parse_arguments() -> Namespace:
         action="store_false",
         help="show FontForge error messages",
     )
-    return parser.parse_args()
+    args = parser.parse_args()
+    if args.command in ["coordinate", "work"] and args.store is None:
+        parser.error(f"--store is required for {args.command}")
+    return args
 
 
 def required(obj: str, paths: Iterable[str]) -> None:
@@ -618,52 +1287,82 @@ def required(obj: str, paths: Iterable[str]) -> None:
         sys.exit(f'Error: missing required files for "{obj}"')
 
 
-def cleanup(keep_tmp_files: bool) -> None:
+def cleanup(tmp_dir: str, keep_tmp_files: bool) -> None:
     # remove tmp directory
-    if not keep_tmp_files and os.path.exists(TMP_DIR):
-        shutil.rmtree(TMP_DIR)
-
-
-def main():
-    print(f"{FAMILY} v{VERSION}\n")
-
-    args = parse_arguments()
+    if not keep_tmp_files and os.path.exists(tmp_dir):
+        shutil.rmtree(tmp_dir)
 
-    # set ErrorSuppressor
-    ErrorSuppressor.enable = args.suppress_error
-
-    # create directories
-    os.makedirs(OUT_DIR, exist_ok=True)
-    os.makedirs(TMP_DIR, exist_ok=True)
-
-    # call cleanup on exit
-    atexit.register(cleanup, args.keep_tmp_files)
 
+def variant_params(args: Namespace) -> list[FontParams]:
     if args.all or args.single is None:
-        # generate all families, weights, styles
-        for slim, bold, italic in itertools.product([False, True], repeat=3):
-            generate(
-                FontParams(
-                    slim=slim,
-                    bold=bold,
-                    italic=italic,
-                    nerd=args.nerd,
-                    freeze_features=args.freeze_features,
-                    ext=args.ext,
-                )
+        # all families, weights, styles
+        return [
+            FontParams(
+                slim=slim,
+                bold=bold,
+                italic=italic,
+                nerd=args.nerd,
+                dedup=args.dedup,
+                compact=args.compact,
+                freeze_features=args.freeze_features,
+                ext=args.ext,
+                coverage=args.coverage,
             )
+            for slim, bold, italic in itertools.product([False, True], repeat=3)
+        ]
     else:
-        # generate a single font file as specified
-        generate(
+        # a single font file as specified
+        return [
             FontParams(
                 slim="slim" in args.single,
                 bold="bold" in args.single,
                 italic="italic" in args.single,
                 nerd=args.nerd,
+                dedup=args.dedup,
+                compact=args.compact,
                 freeze_features=args.freeze_features,
                 ext=args.ext,
+                coverage=args.coverage,
             )
-        )
+        ]
+
+
+def main():
+    args = parse_arguments()
+
+    params_list = variant_params(args)
+    if args.command == "plan":
+        # no banner, as the output is read by other programs
+        plan(params_list)
+        return
+
+    print(f"{FAMILY} v{VERSION}\n")
+
+    # set ErrorSuppressor
+    ErrorSuppressor.enable = args.suppress_error
+
+    # create directories
+    os.makedirs(OUT_DIR, exist_ok=True)
+
+    if args.command == "work":
+        work(args.store, args.keep_tmp_files)
+        return
+    if args.command == "coordinate":
+        with Packager() if args.package else nullcontext() as packager:
+            coordinate(params_list, args.store, packager)
+        return
+
+    os.makedirs(TMP_DIR, exist_ok=True)
+
+    # call cleanup on exit
+    atexit.register(cleanup, TMP_DIR, args.keep_tmp_files)
+
+    # packaging runs alongside the generation of remaining fonts
+    with Packager() if args.package else nullcontext() as packager:
+        for params in params_list:
+            path = generate(params)
+            if packager is not None:
+                packager.add(path, params)
 
 
 if __name__ == "__main__":
@@ -5,6 +5,7 @@ COPYRIGHT = "Copyright 2021 negset"
 SRC_DIR = "src"
 OUT_DIR = "out"
 TMP_DIR = "tmp"
+GOLDEN_DIR = "golden"
 SRC_FILES = {
     "Regular": [
         f"{SRC_DIR}/FiraCode-Regular.ttf",
@@ -22,6 +23,32 @@ ITALIC_SKEW = 12
 ITALIC_OFFSET = -100
 SLIM_SCALE = 0.85
 
+# distributed build (seconds)
+JOB_POLL_INTERVAL = 1
+JOB_HEARTBEAT = 30
+JOB_TIMEOUT = 300  # regard worker as dead if no heartbeat
+MAX_JOB_ATTEMPTS = 3
+
+# keep merged SingleSubst (format 2) offsets within 16 bits
+MAX_SINGLE_SUBST_GLYPHS = 0x3FFF
+
+# codepoint ranges of Latin, kana and symbols used with them
+KANA_COVERAGE_RANGES = [
+    (0x0000, 0x024F),  # Basic Latin ... Latin Extended-B
+    (0x2000, 0x206F),  # General Punctuation
+    (0x3000, 0x30FF),  # CJK Symbols and Punctuation, Hiragana, Katakana
+    (0x31F0, 0x31FF),  # Katakana Phonetic Extensions
+    (0xFF00, 0xFFEF),  # Halfwidth and Fullwidth Forms
+]
+# coverage profiles of Plex glyphs to copy: (codepoint ranges, JIS X 0208 rows)
+# None means all glyphs
+COVERAGE_PROFILES = {
+    "full": None,
+    "kana": (KANA_COVERAGE_RANGES, None),
+    # non-kanji (rows 1-8) and JIS level 1 kanji (rows 16-47)
+    "jis1": (KANA_COVERAGE_RANGES, (1, 47)),
+}
+
 ITALIC_GLYPH_NAMES = ["a", "b", "e", "f", "g", "k", "q"]
 OVERWRITE_GLYPH_NAMES = ["uni300C", "uni300D"]  # "「", "」"
 FEATURE_GLYPH_NAMES = {
@@ -0,0 +1,160 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+from threading import Event, Thread
+
+from settings import JOB_HEARTBEAT, JOB_TIMEOUT
+
+
+class ArtifactStore:
+    """Content-addressed file store in a (shared) directory."""
+
+    def __init__(self, root: str) -> None:
+        self.root = f"{root}/objects"
+        os.makedirs(self.root, exist_ok=True)
+
+    def put(self, path: str) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            while chunk := f.read(1 << 20):
+                digest.update(chunk)
+        key = digest.hexdigest()
+        object_path = self.object_path(key)
+        if not os.path.exists(object_path):
+            os.makedirs(os.path.dirname(object_path), exist_ok=True)
+            # copy to unique name first so that readers never see partial files
+            tmp_path = f"{object_path}.{uuid.uuid4().hex}.tmp"
+            shutil.copyfile(path, tmp_path)
+            os.replace(tmp_path, object_path)
+        return key
+
+    def get(self, key: str, path: str) -> None:
+        shutil.copyfile(self.object_path(key), path)
+
+    def object_path(self, key: str) -> str:
+        return f"{self.root}/{key[:2]}/{key}"
+
+
+class JobQueue:
+    """Job queue in a (shared) directory.
+
+    A job is a JSON file which moves from pending/ to running/ when a worker
+    claims it, and whose result is written to done/ or failed/.
+    Claiming is an atomic rename, so any number of workers can share a queue.
+    Each run of a coordinator has its own id in RUN, and STOP holds the id of
+    the run which has finished.
+    """
+
+    STATES = ["pending", "running", "done", "failed"]
+
+    def __init__(self, root: str) -> None:
+        self.root = f"{root}/jobs"
+        for state in self.STATES:
+            os.makedirs(f"{self.root}/{state}", exist_ok=True)
+
+    def reset(self) -> None:
+        """Starts a new run with an empty queue."""
+        for state in self.STATES:
+            for name in os.listdir(f"{self.root}/{state}"):
+                os.remove(f"{self.root}/{state}/{name}")
+        self.write_marker("RUN", uuid.uuid4().hex)
+
+    def push(self, job: dict) -> None:
+        self.write("pending", job["id"], job)
+
+    def claim(self) -> dict | None:
+        for name in sorted(os.listdir(f"{self.root}/pending")):
+            try:
+                os.rename(f"{self.root}/pending/{name}", f"{self.root}/running/{name}")
+            except FileNotFoundError:
+                # claimed by another worker
+                continue
+            # rename keeps mtime of pending job, which is not a heartbeat
+            os.utime(f"{self.root}/running/{name}")
+            with open(f"{self.root}/running/{name}", encoding="UTF-8") as f:
+                return json.load(f)
+        return None
+
+    def heartbeat(self, job_id: str) -> Event:
+        """Keeps touching a running job until the returned event is set."""
+        stop = Event()
+
+        def run() -> None:
+            while not stop.wait(JOB_HEARTBEAT):
+                try:
+                    os.utime(f"{self.root}/running/{job_id}.json")
+                except FileNotFoundError:
+                    break
+
+        Thread(target=run, daemon=True).start()
+        return stop
+
+    def finish(self, job_id: str, result: dict, failed: bool = False) -> None:
+        self.write("failed" if failed else "done", job_id, result)
+        try:
+            os.remove(f"{self.root}/running/{job_id}.json")
+        except FileNotFoundError:
+            # already taken back by coordinator
+            pass
+
+    def results(self, state: str) -> list[dict]:
+        """Pops results in done/ or failed/."""
+        results = []
+        for name in sorted(os.listdir(f"{self.root}/{state}")):
+            path = f"{self.root}/{state}/{name}"
+            with open(path, encoding="UTF-8") as f:
+                results.append(json.load(f))
+            os.remove(path)
+        return results
+
+    def stale(self) -> list[dict]:
+        """Pops running jobs whose worker has not been heard for a while."""
+        jobs = []
+        for name in sorted(os.listdir(f"{self.root}/running")):
+            path = f"{self.root}/running/{name}"
+            try:
+                if time.time() - os.path.getmtime(path) < JOB_TIMEOUT:
+                    continue
+                with open(path, encoding="UTF-8") as f:
+                    jobs.append(json.load(f))
+                os.remove(path)
+            except FileNotFoundError:
+                # finished in the meantime
+                continue
+        return jobs
+
+    def has_running(self) -> bool:
+        return bool(os.listdir(f"{self.root}/running"))
+
+    def stop(self) -> None:
+        self.write_marker("STOP", self.read_marker("RUN"))
+
+    def stopped_run(self) -> str | None:
+        """Returns id of the current run if it has finished."""
+        run_id = self.read_marker("RUN")
+        if run_id is not None and self.read_marker("STOP") == run_id:
+            return run_id
+        return None
+
+    def read_marker(self, name: str) -> str | None:
+        try:
+            with open(f"{self.root}/{name}", encoding="UTF-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def write_marker(self, name: str, value: str | None) -> None:
+        tmp_path = f"{self.root}/{name}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "w", encoding="UTF-8") as f:
+            f.write(value or "")
+        os.replace(tmp_path, f"{self.root}/{name}")
+
+    def write(self, state: str, job_id: str, data: dict) -> None:
+        path = f"{self.root}/{state}/{job_id}.json"
+        tmp_path = f"{self.root}/{job_id}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "w", encoding="UTF-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+
+import hashlib
+import json
+import os
+import sys
+from argparse import ArgumentParser
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from glob import glob
+from io import StringIO
+
+from fontTools.misc.roundTools import otRound
+from fontTools.misc.xmlWriter import XMLWriter
+from fontTools.pens.recordingPen import DecomposingRecordingPen
+from fontTools.ttLib import TTFont
+from settings import GOLDEN_DIR, OUT_DIR
+
+OS2_RANGES = [
+    "ulUnicodeRange1",
+    "ulUnicodeRange2",
+    "ulUnicodeRange3",
+    "ulUnicodeRange4",
+    "ulCodePageRange1",
+    "ulCodePageRange2",
+]
+
+
+def main():
+    parser = ArgumentParser(description="Output font verifier for Firple Generator")
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        help=f"font files to verify (default: all fonts in {OUT_DIR}/)",
+    )
+    parser.add_argument(
+        "-u",
+        "--update",
+        action="store_true",
+        help="store fingerprints as new golden files instead of verifying",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="number of worker processes (default: number of CPUs)",
+    )
+    args = parser.parse_args()
+
+    paths = args.paths or sorted(
+        path
+        for ext in ["ttf", "otf", "woff", "woff2"]
+        for path in glob(f"{OUT_DIR}/*.{ext}")
+    )
+    if not paths:
+        sys.exit(f'Error: no font files found in "{OUT_DIR}/"')
+
+    os.makedirs(GOLDEN_DIR, exist_ok=True)
+    task = update if args.update else verify
+    with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+        results = list(executor.map(task, paths))
+
+    for path, errors in zip(paths, results):
+        print(f"[{os.path.basename(path)}] {'NG' if errors else 'OK'}")
+        for error in errors:
+            print(f"| {error}")
+    if any(results):
+        sys.exit("Error: some fonts do not match their golden fingerprints")
+
+
+def update(path: str) -> list[str]:
+    with open(golden_path(path), "w", encoding="UTF-8") as f:
+        json.dump(fingerprint(path), f, indent=1, sort_keys=True)
+    return []
+
+
+def verify(path: str) -> list[str]:
+    if not os.path.exists(golden_path(path)):
+        return [f'golden file not found: "{golden_path(path)}"']
+    with open(golden_path(path), encoding="UTF-8") as f:
+        expected = json.load(f)
+    actual = fingerprint(path)
+
+    errors = []
+    for key in sorted(expected.keys() | actual.keys()):
+        if key != "glyphs":
+            errors += diff_entries(key, expected.get(key), actual.get(key))
+
+    # per-glyph widths and outlines (report only a few names to keep output short)
+    expected_glyphs = expected.get("glyphs", {})
+    actual_glyphs = actual.get("glyphs", {})
+    common_names = expected_glyphs.keys() & actual_glyphs.keys()
+    for label, names in [
+        ("missing glyphs", expected_glyphs.keys() - actual_glyphs.keys()),
+        ("unexpected glyphs", actual_glyphs.keys() - expected_glyphs.keys()),
+        (
+            "changed widths",
+            {
+                name
+                for name in common_names
+                if expected_glyphs[name][0] != actual_glyphs[name][0]
+            },
+        ),
+        (
+            "changed outlines",
+            {
+                name
+                for name in common_names
+                if expected_glyphs[name][1] != actual_glyphs[name][1]
+            },
+        ),
+    ]:
+        if names:
+            sample = ", ".join(sorted(names)[:5])
+            errors.append(f"{label}: {len(names)} ({sample}, ...)")
+    return errors
+
+
+def diff_entries(label: str, expected, actual) -> list[str]:
+    # report only differing entries (and a few samples of them)
+    if expected == actual:
+        return []
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        return [
+            error
+            for key in sorted(expected.keys() | actual.keys())
+            for error in diff_entries(
+                f"{label}.{key}", expected.get(key), actual.get(key)
+            )
+        ]
+    if label.endswith(".lookups") and isinstance(expected, list):
+        # lookups are identified by their indices
+        indices = [
+            i
+            for i in range(max(len(expected), len(actual or [])))
+            if expected[i : i + 1] != (actual or [])[i : i + 1]
+        ]
+        sample = ", ".join(map(str, indices[:5]))
+        return [f"{label}: {len(indices)} changed (indices {sample}, ...)"]
+    if isinstance(expected, list) and isinstance(actual, list):
+        expected_items = {json.dumps(item) for item in expected}
+        actual_items = {json.dumps(item) for item in actual}
+        errors = []
+        for verb, items in [
+            ("removed", expected_items - actual_items),
+            ("added", actual_items - expected_items),
+        ]:
+            if items:
+                sample = ", ".join(sorted(items)[:5])
+                errors.append(f"{label}: {len(items)} {verb} ({sample}, ...)")
+        return errors
+    return [f"{label}: expected {expected}, got {actual}"]
+
+
+def golden_path(path: str) -> str:
+    return f"{GOLDEN_DIR}/{os.path.basename(path)}.json"
+
+
+def fingerprint(path: str) -> dict:
+    with TTFont(path) as font:
+        glyph_set = font.getGlyphSet()
+        half_width = glyph_set["A"].width
+        return {
+            "glyph_count": len(font.getGlyphOrder()),
+            "cmap": codepoint_ranges(font.getBestCmap().keys()),
+            # advance widths counted as half width, full width and others
+            "advance_widths": dict(
+                Counter(
+                    (
+                        "half"
+                        if glyph.width == half_width
+                        else "full" if glyph.width == half_width * 2 else "other"
+                    )
+                    for glyph in glyph_set.values()
+                )
+            ),
+            "gsub": layout_summary(font, "GSUB"),
+            "gpos": layout_summary(font, "GPOS"),
+            "os2": {r: getattr(font["OS/2"], r) for r in OS2_RANGES},
+            "name": sorted(
+                [
+                    r.nameID,
+                    r.platformID,
+                    r.platEncID,
+                    r.langID,
+                    r.toUnicode(),
+                ]
+                for r in font["name"].names
+            ),
+            # glyph name -> [advance width, outline hash]
+            "glyphs": {
+                name: [glyph_set[name].width, outline_hash(glyph_set, name)]
+                for name in font.getGlyphOrder()
+            },
+        }
+
+
+def codepoint_ranges(codepoints) -> list[list[int]]:
+    ranges = []
+    for u in sorted(codepoints):
+        if ranges and ranges[-1][1] + 1 == u:
+            ranges[-1][1] = u
+        else:
+            ranges.append([u, u])
+    return ranges
+
+
+def layout_summary(font: TTFont, tag: str) -> dict:
+    if tag not in font:
+        return {}
+    table = font[tag].table
+    features = sorted(
+        [
+            record.FeatureTag,
+            sorted(record.Feature.LookupListIndex),
+        ]
+        for record in table.FeatureList.FeatureRecord
+    )
+    lookups = [
+        [
+            lookup.LookupType,
+            lookup.LookupFlag,
+            lookup.SubTableCount,
+            lookup_hash(font, lookup),
+        ]
+        for lookup in table.LookupList.Lookup
+    ]
+    scripts = sorted(
+        [
+            record.ScriptTag,
+            record.Script.DefaultLangSys is not None,
+            sorted(lang.LangSysTag for lang in record.Script.LangSysRecord),
+        ]
+        for record in table.ScriptList.ScriptRecord
+    )
+    return {"features": features, "lookups": lookups, "scripts": scripts}
+
+
+def lookup_hash(font: TTFont, lookup) -> str:
+    # hash of XML dump, which covers every mapping, coverage and class
+    writer = XMLWriter(StringIO())
+    lookup.toXML(writer, font)
+    return hashlib.sha256(writer.file.getvalue().encode()).hexdigest()[:16]
+
+
+def outline_hash(glyph_set, name: str) -> str:
+    # decompose so that composite glyphs hash the same as their outlines
+    pen = DecomposingRecordingPen(glyph_set)
+    glyph_set[name].draw(pen)
+    value = [
+        (operator, [pt and (otRound(pt[0]), otRound(pt[1])) for pt in operands])
+        for operator, operands in pen.value
+    ]
+    return hashlib.sha256(repr(value).encode()).hexdigest()[:16]
+
+
+if __name__ == "__main__":
+    main()